@@ -3,9 +3,7 @@ from datetime import datetime
 from types import SimpleNamespace as NS
 from .lib.experiment import Experiment
 from .lib.helpers import resolve
-from .lib.report import make_report, summarize
 import os
-import blessed
 import json
 import sys
 import shutil
@@ -381,6 +379,10 @@ def command_summary(subargv):
     # [alias: -o]
     out: Argument = default(None)
 
+    # pandas and hrepr are only needed here, so they are not imported for
+    # every `milarun run`
+    from .lib.report import summarize
+
     reports = os.path.realpath(os.path.expanduser(reports))
     out = out and os.path.realpath(os.path.expanduser(out))
 
@@ -420,6 +422,8 @@ def command_report(subargv):
     # Title to give to the report
     title: Argument = default(None)
 
+    from .lib.report import make_report, summarize
+
     reports = os.path.realpath(os.path.expanduser(reports))
 
     if os.path.isdir(reports):
@@ -1,7 +1,6 @@
 from datetime import datetime
 from collections import deque
 from contextlib import contextmanager
-import numpy as np
 import time
 import traceback
 import socket
@@ -15,12 +14,26 @@ from .monitor import GPUMonitor
 from .helpers import resolve
 
 
+# Clock used to measure durations. It is monotonic and has the highest
+# available resolution; time.time() is only used for the reported dates.
+_now = time.perf_counter
+
+
 _environ_save = {
     "CUDA_VISIBLE_DEVICES",
     "MILARUN_DATAROOT",
 }
 
 
+# Keys of RateLogger.metrics that toggle fields of the progress line
+# rather than being metrics themselves
+_display_options = {
+    "count",
+    "eta",
+    "rate",
+}
+
+
 def get_gpu_name():
     current_device = torch.cuda.current_device()
     return torch.cuda.get_device_name(current_device)
@@ -38,13 +51,14 @@ class SimpleTimer:
         if self.start is not None:
             raise Exception("Cannot use a SimpleTimer twice")
         self.start = time.time()
+        self._start = _now()
         return self
 
     def __exit__(self, exc_type, value, tb):
         if self.sync:
             self.sync()
         self.end = time.time()
-        self.result = self.end - self.start
+        self.result = _now() - self._start
 
     def report(self):
         return {
@@ -56,6 +70,9 @@ class SimpleTimer:
 
 
 class Counter:
+    # One Counter is created per step
+    __slots__ = ("count", "metrics")
+
     def __init__(self, count, metrics):
         self.count = count
         self.metrics = metrics
@@ -71,29 +88,48 @@ class Counter:
 
 
 class RateLogger:
-    def __init__(self, sample_duration=30, max_count=None, sync=None):
+    def __init__(
+        self,
+        sample_duration=30,
+        max_count=None,
+        sync=None,
+        trigger=None,
+        display_interval=0.25,
+    ):
         self.sample_duration = sample_duration
+        self.display_interval = display_interval
+        self.last_display = None
         self.current = 0
         self.count = 0
         self.results = []
         self.max_count = max_count
         self.total_count = 0
         self.sync = sync
+        self.trigger = trigger
         self.start = 0
-        self.end = 0
         self.total_time = 0
+        # Steps are timed with _now(); only the first step's start is also
+        # taken from the wall clock, for the report
+        self._start_mono = None
+        self._end_mono = None
         self.metrics = {}
         if self.sync:
             self.sync()
 
+    @property
+    def end(self):
+        if self._end_mono is None:
+            return 0
+        return self.start + (self._end_mono - self._start_mono)
+
     def would_log(self, duration):
         return self.current + duration >= self.sample_duration
 
     def elapse_sync(self):
         if self.sync:
-            start = time.time()
+            start = _now()
             self.sync()
-            end = time.time()
+            end = _now()
             self.elapse(end - start, 0)
 
     def elapse(self, duration, count):
@@ -107,43 +143,59 @@ class RateLogger:
             self.results.extend([unit / self.sample_duration] * int(nblocks))
             self.current = self.current % self.sample_duration
             self.count = self.count % unit
+            if self.trigger:
+                # Sample the GPUs at the boundary of each rate sample
+                self.trigger()
             if self.metrics:
-                items = []
-                if self.metrics.get("count", True):
-                    l = len(str(self.max_count or 0))
-                    items.append(
-                        f"[{int(self.total_count):>{l}}/{self.max_count or '?'}]",
-                    )
-                if self.metrics.get("eta", True):
-                    estimate = self.total_time * (self.max_count / self.total_count)
-                    eta = estimate - self.total_time
-                    items.append(
-                        f"[ETA: {eta//60:.0f}m{eta%60:02.0f}s]"
-                    )
-                if self.metrics.get("rate", True):
-                    items.append(
-                        f"[{self.results[-1]:.2f} items/s]"
-                    )
-                for k, v in self.metrics.items():
-                    if k in ("count", "eta", "rate"):
-                        continue
-                    items.append(f"{k}={v}")
-                print(*items)
+                self.display()
+
+    def display(self):
+        # Samples can be much shorter than what is worth printing, so the
+        # progress line is printed at most once per display_interval
+        now = _now()
+        if (
+            self.last_display is not None
+            and now - self.last_display < self.display_interval
+        ):
+            return
+        self.last_display = now
+        items = []
+        if self.metrics.get("count", True):
+            l = len(str(self.max_count or 0))
+            items.append(
+                f"[{int(self.total_count):>{l}}/{self.max_count or '?'}]",
+            )
+        if self.metrics.get("eta", True):
+            estimate = self.total_time * (self.max_count / self.total_count)
+            eta = estimate - self.total_time
+            items.append(
+                f"[ETA: {eta//60:.0f}m{eta%60:02.0f}s]"
+            )
+        if self.metrics.get("rate", True):
+            items.append(
+                f"[{self.results[-1]:.2f} items/s]"
+            )
+        for k, v in self.metrics.items():
+            if k in _display_options:
+                continue
+            items.append(f"{k}={v}")
+        print(*items)
 
     @contextmanager
     def __call__(self, *, count=1, key=None):
+        count = Counter(count=count, metrics=self.metrics)
+        start = _now()
         if not self.start:
             self.start = time.time()
-        count = Counter(count=count, metrics=self.metrics)
-        start = time.time()
+            self._start_mono = start
         yield count
-        end = time.time()
+        end = _now()
         if self.sync and self.would_log(end - start):
             # Sync only when we go over the sample_duration
             self.sync()
-            end = time.time()
+            end = _now()
         self.elapse(end - start, count.count)
-        self.end = time.time()
+        self._end_mono = end
 
     def finalize(self):
         self.elapse_sync()
@@ -165,7 +217,7 @@ class RateLogger:
             "overhead": wall_time - self.total_time,
             "sample_duration": self.sample_duration,
             "rates": self.results,
-            "metrics": {k: v for k, v in self.metrics.items() if k not in ("count", "eta", "rate")},
+            "metrics": {k: v for k, v in self.metrics.items() if k not in _display_options},
         }
 
     def done(self):
@@ -175,12 +227,13 @@ class RateLogger:
 class Chronos:
     def __init__(self):
         self.chronos = {}
+        self.trigger = None
 
     def create(self, name, type, **kwargs):
         if name in self.chronos:
             raise Exception(f"Chrono {name} already exists.")
         if type == "rate":
-            chrono = RateLogger(**kwargs)
+            chrono = RateLogger(trigger=self.trigger, **kwargs)
         elif type == "timer":
             chrono = SimpleTimer(**kwargs)
         else:
@@ -213,6 +266,7 @@ class Experiment:
             monitor = GPUMonitor(1)
             monitor.setDaemon(True)
             monitor.start()
+            self.chronos.trigger = monitor.trigger
         try:
             fn()
         except Exception as e:
@@ -225,17 +279,8 @@ class Experiment:
             self.results["error"] = None
         if self.monitor_gpu_usage:
             monitor.stop()
-            self.usage = {
-                gid: {
-                    k: {
-                        "min": np.min(v) if v else -1,
-                        "mean": np.mean(v) if v else -1,
-                        "max": np.max(v) if v else -1,
-                    }
-                    for k, v in gdata.items()
-                }
-                for gid, gdata in monitor.data.items()
-            }
+            monitor.join()
+            self.usage = monitor.summary()
 
     def __getitem__(self, key):
         return self.results[key]
@@ -25,15 +25,17 @@ def cycle(it):
 
 
 def dataloop(it, wrapper):
-    iterator = iter(cycle(it))
+    # This runs once per step, so bound methods are looked up only once
+    advance = iter(cycle(it)).__next__
+    done = wrapper.done
     while True:
         try:
             with wrapper() as w:
-                data = next(iterator)
+                data = advance()
                 yield w, data
         except StopIteration:
             break
-        if wrapper.done():
+        if done():
             break
 
 
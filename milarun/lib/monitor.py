@@ -1,30 +1,139 @@
-import GPUtil
-from threading import Thread
+import numpy as np
+import pynvml
+from threading import Event, Lock, Thread
 import time
 
 
+_fields = ("load", "memory", "temperature")
+
+# Factors applied to the raw buffered values when summarizing. Load is
+# buffered as an integer percentage so that it is exact in float32.
+_scales = (1 / 100, 1, 1)
+
+
+def _load(h):
+    return pynvml.nvmlDeviceGetUtilizationRates(h).gpu
+
+
+def _memory(h):
+    return pynvml.nvmlDeviceGetMemoryInfo(h).used / 1024 ** 2
+
+
+def _temperature(h):
+    return pynvml.nvmlDeviceGetTemperature(h, pynvml.NVML_TEMPERATURE_GPU)
+
+
+# Raw values, in the order of _fields: load in percent, memory in MB,
+# temperature in C
+_queries = (_load, _memory, _temperature)
+
+
+def _query(fn, *args):
+    # Some devices do not support every query (NVMLError_NotSupported).
+    # Record NaN for that field, as GPUtil did, rather than letting the
+    # error kill the monitor thread.
+    try:
+        return fn(*args)
+    except pynvml.NVMLError:
+        return np.nan
+
+
 class GPUMonitor(Thread):
-    def __init__(self, delay):
+    def __init__(self, delay, flush_interval=10, buffer_size=64):
         super().__init__()
-        self.stopped = False
         self.delay = delay
-        self.data = {
-            g.id: dict(
-                load=[],
-                memory=[],
-                temperature=[]
-            )
-            for g in GPUtil.getGPUs()
+        self.flush_interval = flush_interval
+        self._wakeup = Event()
+        self._stop_evt = Event()
+        self._lock = Lock()
+        try:
+            pynvml.nvmlInit()
+        except pynvml.NVMLError:
+            # No NVIDIA driver (e.g. AMD GPUs): monitor no GPUs, like
+            # GPUtil.getGPUs() returning an empty list
+            self.nvml = False
+            self.handles = []
+        else:
+            self.nvml = True
+            self.handles = [
+                pynvml.nvmlDeviceGetHandleByIndex(i)
+                for i in range(pynvml.nvmlDeviceGetCount())
+            ]
+        ngpus = len(self.handles)
+        # Raw samples are written in place in this preallocated buffer,
+        # indexed as [field, sample, gpu], until the next flush, so that
+        # the samples of each field are contiguous. float32 is plenty for
+        # the sampled values; the aggregates are float64.
+        self.buffer = np.empty(
+            (len(_fields), buffer_size, ngpus), dtype=np.float32
+        )
+        self.buffered = 0
+        # Running aggregates, updated from the buffer on each flush.
+        # Rows are _fields, columns are GPUs.
+        shape = (len(_fields), ngpus)
+        self.count = 0
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+        self.total = np.zeros(shape)
+
+    def sample(self):
+        with self._lock:
+            t = self.buffered
+            for gid, h in enumerate(self.handles):
+                for i, query in enumerate(_queries):
+                    self.buffer[i, t, gid] = _query(query, h)
+            self.buffered += 1
+            if self.buffered == self.buffer.shape[1]:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self.buffered:
+            return
+        batch = self.buffer[:, :self.buffered]
+        np.minimum(self.min, batch.min(axis=1), out=self.min)
+        np.maximum(self.max, batch.max(axis=1), out=self.max)
+        self.total += batch.sum(axis=1, dtype=np.float64)
+        self.count += self.buffered
+        self.buffered = 0
+
+    def summary(self):
+        self.flush()
+        n = self.count
+        return {
+            gid: {
+                # Same units as GPUtil: load in [0, 1], memory in MB
+                k: {
+                    "min": float(self.min[i, gid]) * scale if n else -1,
+                    "mean": float(self.total[i, gid] / n) * scale if n else -1,
+                    "max": float(self.max[i, gid]) * scale if n else -1,
+                }
+                for i, (k, scale) in enumerate(zip(_fields, _scales))
+            }
+            for gid in range(len(self.handles))
         }
 
     def run(self):
-        while not self.stopped:
-            for g in GPUtil.getGPUs():
-                data = self.data[g.id]
-                data["load"].append(g.load)
-                data["memory"].append(g.memoryUsed)
-                data["temperature"].append(g.temperature)
-            time.sleep(self.delay)
+        last_flush = time.monotonic()
+        while not self._stop_evt.is_set():
+            self.sample()
+            if time.monotonic() - last_flush >= self.flush_interval:
+                self.flush()
+                last_flush = time.monotonic()
+            # Heartbeat every `delay` seconds, or earlier if triggered
+            self._wakeup.wait(self.delay)
+            self._wakeup.clear()
+        # Shut down from this thread so that no sample is in flight
+        if self.nvml:
+            pynvml.nvmlShutdown()
+
+    def trigger(self):
+        self._wakeup.set()
 
     def stop(self):
-        self.stopped = True
+        self._stop_evt.set()
+        # Wake up the loop so that it exits right away
+        self._wakeup.set()
@@ -64,19 +64,26 @@ def summarize_group(group):
     pergpu = defaultdict(list)
     peak_memory = 0
     for entry in group:
-        for k, v in entry["timings"].items():
-            if k.startswith("train"):
-                mean = np.mean(v["rates"][-20:-2])
-                rates.append(mean)
-                device = entry["environ"].get("CUDA_VISIBLE_DEVICES", ",").split(",")
-                if len(device) == 1:
-                    device, = device
-                    pergpu[int(device)].append(mean)
-                    peak = entry["gpu_monitor"][device]["memory"]["max"]
-                    peak_memory = max(peak_memory, peak)
-                else:
-                    for _, v in entry["gpu_monitor"].items():
-                        peak_memory = max(peak_memory, v["memory"]["max"])
+        means = [
+            np.mean(v["rates"][-20:-2])
+            for k, v in entry["timings"].items()
+            if k.startswith("train")
+        ]
+        if not means:
+            continue
+        rates.extend(means)
+        # The device and the GPU usage are the same for every timing of
+        # an entry, so they are only looked up once
+        device = entry["environ"].get("CUDA_VISIBLE_DEVICES", ",").split(",")
+        gpu_monitor = entry["gpu_monitor"]
+        if len(device) == 1:
+            device, = device
+            pergpu[int(device)].extend(means)
+            peak = gpu_monitor[device]["memory"]["max"]
+            peak_memory = max(peak_memory, peak)
+        else:
+            for v in gpu_monitor.values():
+                peak_memory = max(peak_memory, v["memory"]["max"])
     assert n > 0
 
     return {
@@ -180,7 +187,9 @@ class Table:
 class Outputter:
     def __init__(self, stdout, html):
         self.stdout = stdout
-        self.html_file = html and open(html, 'w')
+        # The report is written in many small pieces, so give the file a
+        # large buffer; it is flushed and closed in finalize()
+        self.html_file = html and open(html, 'w', buffering=65536)
         self._html(_table_style)
 
     def _html(self, contents):
@@ -226,7 +235,9 @@ class Outputter:
         self._text("=" * len(title))
 
     def finalize(self):
-        self.html("</body>")
+        self._html("</body></html>")
+        if self.html_file:
+            self.html_file.close()
 
 
 def _report_pergpu(entries, measure='mean'):
@@ -314,6 +325,8 @@ def make_report(
             out.section(f"GPU comparison ({measure})")
             out.print(df)
 
+    out.finalize()
+
 
 _formatters = {
     'n': '{:.0f}'.format,
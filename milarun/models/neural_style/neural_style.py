@@ -22,6 +22,7 @@ from milarun.lib import coleo_main, init_torch, iteration_wrapper, dataloop, mem
 
 here = os.path.dirname(os.path.realpath(__file__))
 repo_base = os.path.join(here, "..", "..", "..")
+debug = bool(os.getenv("MILARUN_DEBUG"))
 
 
 @coleo_main
@@ -74,7 +75,9 @@ def main(exp):
     mse_loss = torch.nn.MSELoss()
 
     vgg = Vgg16(requires_grad=False).to(device)
-    print(memory_size(vgg, batch_size=batch_size, input_size=(3, image_size, image_size)) * 4)
+    if debug:
+        # memory_size runs a full forward pass, only pay for it on request
+        print(memory_size(vgg, batch_size=batch_size, input_size=(3, image_size, image_size)) * 4)
 
     style_transform = transforms.Compose([
         transforms.ToTensor(),